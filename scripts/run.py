@@ -1,14 +1,19 @@
 """Run a CliMA performance benchmark for a given date."""
 
 import argparse
+import contextlib
+import functools
+import hashlib
 import json
 import os
 import shutil
+import signal
 import subprocess
+import threading
+import tomllib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
-import git
-
 REPOS = [
     "ClimaCoupler.jl",
     "ClimaAtmos.jl",
@@ -18,40 +23,88 @@ REPOS = [
     "RRTMGP.jl",
 ]
 
+# Abort Julia commands that print nothing for this many seconds, e.g., if
+# precompilation hangs on a network stall
+JULIA_IDLE_TIMEOUT = 60 * 60
+
+# Minimum fraction of package revs another run's environment must share with
+# the current one for it to be reused
+ENV_REUSE_MIN_OVERLAP = 0.5
+
+# Repos whose files we check out, so they need full (non-partial) clones
+FULL_CLONE_REPOS = ["ClimaCoupler.jl"]
 
-def get_latest_commit_at_date(repo_path: str, date: str) -> dict | None:
-    """Return the latest commit hash of the repository as of a specific date.
 
-    If no commits were made, return None.
+def fetch_repo(repo_path: str, blobless: bool = False):
+    """Fetch the latest ``main`` branch of a repository from its origin.
 
-    Note that we include commits made on the given date by adding one day to
-    the ``until`` parameter.
+    If ``blobless`` is set, file contents are left on the server and the repo
+    becomes a partial clone, which is all we need to resolve revs by date.
+    Git will lazily fetch any blobs that are needed later on.
     """
-    # Don't allow running for the current day, since that can cause
-    # irreproducible results
-    if datetime.fromisoformat(date).date() >= datetime.now().date():
-        raise ValueError("Date must be in the past")
-    repo = git.Repo(repo_path)
-    repo.remotes.origin.fetch()
-    commits = repo.iter_commits(
-        "origin/main",
-        until=datetime.fromisoformat(date) + timedelta(days=1),
-    )
-    for commit in commits:
-        return {
-            "rev": commit.hexsha,
-            "timestamp": commit.committed_datetime.isoformat(),
-        }
+    cmd = ["git", "-C", repo_path, "fetch", "--quiet"]
+    if blobless:
+        cmd.append("--filter=blob:none")
+    subprocess.run(cmd + ["origin", "main"], check=True)
+
+
+@functools.lru_cache(maxsize=None)
+def get_latest_commit_at_date(repo_path: str, until: int) -> dict | None:
+    """Return the latest commit hash of the repository made before ``until``,
+    given as a Unix timestamp.
+
+    If no commits were made, return None. The repository should be fetched
+    first with ``fetch_repo``.
+    """
+    # Let git do the date filtering and formatting in a single call rather
+    # than walking commits in Python
+    out = subprocess.run(
+        [
+            "git",
+            "-C",
+            repo_path,
+            "log",
+            "-1",
+            "--format=%H%x00%cI",
+            f"--before=@{until}",
+            "origin/main",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.strip()
+    if not out:
+        return None
+    rev, timestamp = out.split("\0")
+    return {"rev": rev, "timestamp": timestamp}
 
 
 def get_repo_revs_at_date(date: str) -> dict:
     """Return a dictionary mapping repository names to their respective commit
     hashes at a specific date.
     """
+    day = datetime.fromisoformat(date)
+    # Don't allow running for the current day, since that can cause
+    # irreproducible results
+    if day.date() >= datetime.now().date():
+        raise ValueError("Date must be in the past")
+    # Include commits made on the given date by adding one day to the cutoff,
+    # and pass it to git as an epoch so it's compared as a plain integer
+    until = int((day + timedelta(days=1)).timestamp())
+    repo_paths = {repo: os.path.join("./repos", repo) for repo in REPOS}
+    # Fetches are network-bound, so run them all at once. Only ClimaCoupler
+    # is checked out, so the rest only need commit metadata
+    with ThreadPoolExecutor(max_workers=len(REPOS)) as executor:
+        list(
+            executor.map(
+                fetch_repo,
+                repo_paths.values(),
+                [repo not in FULL_CLONE_REPOS for repo in repo_paths],
+            )
+        )
     commits = {}
-    for repo in REPOS:
-        repo_path = os.path.join("./repos", repo)
-        rev = get_latest_commit_at_date(repo_path, date)
+    for repo, repo_path in repo_paths.items():
+        rev = get_latest_commit_at_date(repo_path, until)
         if rev is None:
             raise ValueError(
                 f"No commits found for repository {repo} at date {date}"
@@ -60,26 +113,332 @@ def get_repo_revs_at_date(date: str) -> dict:
     return commits
 
 
-def run_julia_command(env_dir: str, command: str, check: bool = True):
-    """Run a Julia command in a specific environment."""
-    cmd = ["julia", "--project=" + env_dir, "-e", command]
-    subprocess.run(cmd, check=check)
+# Sentinel printed by the Julia session after each command finishes
+JULIA_DONE = "__CLIMA_PERF_DONE__"
+
+# Julia program that runs commands read from stdin, one at a time. Each
+# command is sent as a line count followed by that many lines, and is
+# followed by a sentinel line with its status
+JULIA_SESSION_PROGRAM = f"""
+while !eof(stdin)
+    n = parse(Int, readline(stdin))
+    command = join([readline(stdin) for _ in 1:n], "\\n")
+    ok = try
+        include_string(Main, command)
+        true
+    catch err
+        showerror(stdout, err, catch_backtrace())
+        println()
+        false
+    end
+    flush(stderr)
+    println("{JULIA_DONE} ", ok ? "ok" : "failed")
+    flush(stdout)
+end
+"""
+
+
+class JuliaSession:
+    """A long-lived Julia process in a specific environment.
+
+    Commands are sent to the same process, so Julia startup and package
+    loading (e.g., ``using Pkg``) are only paid once. Output is streamed
+    through the log as it arrives, and the process is killed if a command
+    goes ``idle_timeout`` seconds without printing anything.
+    """
+
+    def __init__(self, env_dir: str, idle_timeout: float = JULIA_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        # Skip user startup files, which shouldn't affect the environment.
+        # Note we can't lower the optimization or compile level here, since
+        # precompile workers inherit those flags and the resulting caches
+        # wouldn't be reused by the benchmark run
+        self.cmd = [
+            "julia",
+            "--project=" + env_dir,
+            "--startup-file=no",
+            "--history-file=no",
+            "-e",
+            JULIA_SESSION_PROGRAM,
+        ]
+        # Precompile on every CPU we're allowed to use (e.g., in a Slurm
+        # allocation) unless set by the user, and only precompile when asked
+        # rather than automatically after each Pkg.add
+        env = {}
+        num_cpus = os.process_cpu_count() or os.cpu_count()
+        if num_cpus is not None:
+            env["JULIA_NUM_PRECOMPILE_TASKS"] = str(num_cpus)
+        env |= os.environ
+        env["JULIA_PKG_PRECOMPILE_AUTO"] = "0"
+        self.proc = subprocess.Popen(
+            self.cmd,
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            # Run in a new process group so precompile workers can be killed
+            # along with Julia
+            start_new_session=True,
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.kill()
+
+    def kill(self):
+        """Kill Julia and any processes it started."""
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        self.proc.wait()
+
+    def close(self):
+        """Let Julia exit once it has run all commands."""
+        self.proc.stdin.close()
+        self.proc.wait()
+
+    def run(self, command: str, check: bool = True) -> bool:
+        """Run a Julia command and return whether it succeeded."""
+        lines = command.splitlines()
+        self.proc.stdin.write("\n".join([str(len(lines)), *lines]) + "\n")
+        self.proc.stdin.flush()
+        timed_out = threading.Event()
+
+        def on_idle():
+            timed_out.set()
+            self.kill()
+
+        watchdog = threading.Timer(self.idle_timeout, on_idle)
+        watchdog.start()
+        status = None
+        try:
+            for line in self.proc.stdout:
+                # The sentinel may be glued onto the end of output that
+                # didn't end with a newline
+                if JULIA_DONE in line:
+                    output, _, status = line.partition(JULIA_DONE)
+                    if output:
+                        log(output)
+                    status = status.strip()
+                    break
+                log(line.rstrip())
+                watchdog.cancel()
+                watchdog = threading.Timer(self.idle_timeout, on_idle)
+                watchdog.start()
+        except BaseException:
+            # Julia is in its own session, so it won't see a Ctrl-C
+            self.kill()
+            raise
+        finally:
+            watchdog.cancel()
+        if timed_out.is_set():
+            raise TimeoutError(
+                f"Julia produced no output for {self.idle_timeout} seconds"
+            )
+        if status is None:
+            raise subprocess.CalledProcessError(
+                self.proc.wait(), self.cmd[:-1]
+            )
+        if check and status != "ok":
+            raise RuntimeError(f"Julia command failed: {command}")
+        return status == "ok"
 
 
 def copy_file_at_rev(repo_path: str, rev: str, src_path: str, dest_path: str):
     """Get the contents of a file at a specific Git revision."""
-    repo = git.Repo(repo_path)
-    file_contents = repo.git.show(f"{rev}:{src_path}")
-    with open(dest_path, "w") as f:
+    file_contents = subprocess.run(
+        ["git", "-C", repo_path, "show", f"{rev}:{src_path}"],
+        capture_output=True,
+        check=True,
+    ).stdout
+    with open(dest_path, "wb") as f:
         f.write(file_contents)
 
 
 def copy_repo_at_rev(repo_path: str, rev: str, dest_path: str):
-    """Copy entire repository at a specific revision to destination."""
-    os.makedirs(dest_path, exist_ok=True)
-    # Use git archive and extract in one go
-    cmd = f"git -C {repo_path} archive {rev} | tar -x -C {dest_path}"
-    subprocess.run(cmd, shell=True, check=True)
+    """Check out a repository at a specific revision to destination.
+
+    This uses a detached Git worktree, so files are checked out straight from
+    the local object store rather than streamed through an archive.
+    """
+    # Forget worktrees whose directories were deleted without git knowing,
+    # otherwise adding one at the same path fails
+    subprocess.run(["git", "-C", repo_path, "worktree", "prune"], check=True)
+    subprocess.run(
+        [
+            "git",
+            "-C",
+            repo_path,
+            "worktree",
+            "add",
+            "--detach",
+            os.path.abspath(dest_path),
+            rev,
+        ],
+        check=True,
+    )
+
+
+def remove_repo_copy(repo_path: str, dest_path: str):
+    """Remove a repository copy created by ``copy_repo_at_rev``."""
+    result = subprocess.run(
+        [
+            "git",
+            "-C",
+            repo_path,
+            "worktree",
+            "remove",
+            "--force",
+            os.path.abspath(dest_path),
+        ],
+        capture_output=True,
+    )
+    # Fall back to deleting the directory if it's not a worktree, e.g., if it
+    # was extracted with git archive by an older version of this script
+    if result.returncode != 0:
+        shutil.rmtree(dest_path)
+    subprocess.run(["git", "-C", repo_path, "worktree", "prune"], check=True)
+
+
+def link_or_copy(src: str, dest: str):
+    """Hardlink a read-only input file to destination, replacing any existing
+    file there.
+
+    Falls back to copying, e.g., if the two paths are on different
+    filesystems.
+    """
+    if os.path.lexists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copy2(src, dest)
+
+
+def get_env_dir(run_dir: str) -> str:
+    """Return the ClimaEarth environment directory for a benchmark run."""
+    return os.path.join(
+        run_dir, "ClimaCoupler.jl", "experiments", "ClimaEarth"
+    )
+
+
+def is_env_file(fname: str) -> bool:
+    """Return whether a file name is a Julia project or manifest file."""
+    return fname == "Project.toml" or (
+        fname.startswith("Manifest") and fname.endswith(".toml")
+    )
+
+
+def hash_env(env_dir: str) -> str:
+    """Return a SHA-256 hash of an environment's project and manifest files."""
+    h = hashlib.sha256()
+    for fname in sorted(os.listdir(env_dir)):
+        if is_env_file(fname):
+            h.update(fname.encode())
+            with open(os.path.join(env_dir, fname), "rb") as f:
+                h.update(f.read())
+    return h.hexdigest()
+
+
+def get_manifest_repo_revs(env_dir: str) -> dict:
+    """Return a dictionary mapping repo URLs to the revs of packages added
+    from them in an environment's manifest files.
+    """
+    revs = {}
+    for fname in sorted(os.listdir(env_dir)):
+        if not (fname.startswith("Manifest") and fname.endswith(".toml")):
+            continue
+        with open(os.path.join(env_dir, fname), "rb") as f:
+            manifest = tomllib.load(f)
+        for entries in manifest.get("deps", {}).values():
+            for entry in entries:
+                if "repo-url" in entry and "repo-rev" in entry:
+                    revs[entry["repo-url"]] = entry["repo-rev"]
+    return revs
+
+
+def find_reusable_env(
+    run_dir: str, repo_revs: dict
+) -> tuple[str, list[str]] | None:
+    """Find the environment from another benchmark run that shares the most
+    package revs with ``repo_revs``.
+
+    Only runs that finished setting up their environment at the same
+    ClimaCoupler rev, and that share at least ``ENV_REUSE_MIN_OVERLAP`` of the
+    other package revs, are considered.
+    Returns the environment directory and the repos whose revs differ, or
+    None if there is no such run.
+    """
+    runs_dir = os.path.dirname(run_dir)
+    pkg_repos = [repo for repo in REPOS if repo != "ClimaCoupler.jl"]
+    best = None
+    # Go newest first so ties are broken in favor of the most recent run
+    for name in sorted(os.listdir(runs_dir), reverse=True):
+        other_run_dir = os.path.join(runs_dir, name)
+        if other_run_dir == run_dir:
+            continue
+        # Only consider environments a previous run finished setting up, using
+        # the revs that run set them up with. Note repo-revs.json can't be
+        # used for this, since it's tracked in Git and survives the
+        # environment being rebuilt
+        other_env_dir = get_env_dir(other_run_dir)
+        other_state = load_state(other_run_dir)
+        if not (
+            {"add", "precompile"} <= set(other_state.get("done", []))
+            and os.path.isdir(other_env_dir)
+        ):
+            continue
+        other_revs = other_state["repo_revs"]
+        if (
+            other_revs.get("ClimaCoupler.jl", {}).get("rev")
+            != repo_revs["ClimaCoupler.jl"]["rev"]
+        ):
+            continue
+        changed = [
+            repo
+            for repo in pkg_repos
+            if other_revs.get(repo, {}).get("rev") != repo_revs[repo]["rev"]
+        ]
+        n_shared = len(pkg_repos) - len(changed)
+        if n_shared < ENV_REUSE_MIN_OVERLAP * len(pkg_repos):
+            continue
+        # Make sure the manifest actually has the revs we think it does
+        manifest_revs = get_manifest_repo_revs(other_env_dir)
+        if any(
+            manifest_revs.get(f"https://github.com/CliMA/{repo}")
+            != other_revs.get(repo, {}).get("rev")
+            for repo in pkg_repos
+        ):
+            continue
+        if best is None or len(changed) < len(best[1]):
+            best = (other_env_dir, changed)
+    return best
+
+
+def load_state(run_dir: str) -> dict:
+    """Load the progress saved by a previous run of the benchmark, if any."""
+    state_path = os.path.join(run_dir, "state.json")
+    if not os.path.exists(state_path):
+        return {}
+    with open(state_path) as f:
+        return json.load(f)
+
+
+def save_state(run_dir: str, state: dict):
+    """Save benchmark progress so a later run can pick up where it left off."""
+    os.makedirs(run_dir, exist_ok=True)
+    state_path = os.path.join(run_dir, "state.json")
+    # Write to a temporary file first so an interrupted write can't leave a
+    # corrupt state file behind
+    with open(state_path + ".tmp", "w") as f:
+        json.dump(state, f, indent=4)
+    os.replace(state_path + ".tmp", state_path)
 
 
 def log(*args):
@@ -103,64 +462,154 @@ def main():
         default=False,
         help="Only set up the environment.",
     )
+    parser.add_argument(
+        "--fresh-env",
+        action="store_true",
+        default=False,
+        help=(
+            "Always set up the environment from scratch rather than reusing "
+            "one from a previous run with mostly the same revs or skipping "
+            "an instantiate that was already done."
+        ),
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        default=False,
+        help=(
+            "Ignore progress saved by a previous run for this date and set "
+            "up everything again."
+        ),
+    )
     args = parser.parse_args()
     date = args.date
     # Normalize date to YYYY-MM-DD format
     date = datetime.fromisoformat(date).strftime("%Y-%m-%d")
-    repo_revs = get_repo_revs_at_date(date)
+    run_dir = os.path.join("runs", "amip", date)
+    env_dir = get_env_dir(run_dir)
+    coupler_dir = os.path.join(run_dir, "ClimaCoupler.jl")
+    # Pick up where a previous run for this date left off, unless the set of
+    # repos has changed since. Each completed setup phase is recorded in the
+    # state's done list
+    state = {} if args.restart else load_state(run_dir)
+    if state.get("repos") != REPOS:
+        state = {"repos": REPOS, "done": []}
+    done = state["done"]
+    if "revs" in done:
+        log("Using Git revs resolved by a previous run")
+        repo_revs = state["repo_revs"]
+    else:
+        repo_revs = get_repo_revs_at_date(date)
+        state["repo_revs"] = repo_revs
+        done.append("revs")
+        save_state(run_dir, state)
+    # A fresh environment means redoing everything after resolving revs
+    if args.fresh_env:
+        done[:] = ["revs"]
     log(f"Running benchmark for date: {date}")
     log("Git revs:")
     for repo, commit in repo_revs.items():
         rev = commit["rev"]
         log(f"  {repo}: {rev}")
     # Create Julia environment based on ClimaCoupler's ClimaEarth environment
-    run_dir = os.path.join("runs", "amip", date)
     os.makedirs(run_dir, exist_ok=True)
-    env_dir = os.path.join(
-        run_dir, "ClimaCoupler.jl", "experiments", "ClimaEarth"
-    )
-    coupler_rev = repo_revs["ClimaCoupler.jl"]["rev"]
-    log("Copying ClimaCoupler at rev:", coupler_rev)
-    # Delete ClimaCoupler directory if it already exists
-    coupler_dir = os.path.join(run_dir, "ClimaCoupler.jl")
-    if os.path.exists(coupler_dir):
-        log("Removing existing ClimaCoupler directory:", coupler_dir)
-        shutil.rmtree(coupler_dir)
-    copy_repo_at_rev(
-        repo_path="./repos/ClimaCoupler.jl",
-        rev=coupler_rev,
-        dest_path=coupler_dir,
-    )
-    # Instantiate the environment
-    log("Instantiating ClimaEarth environment at:", env_dir)
-    run_julia_command(env_dir, "using Pkg; Pkg.instantiate();", check=True)
-    # Add the rev for each package to the environment
-    julia_cmd_template = (
-        'using Pkg; Pkg.add(Pkg.PackageSpec(;url="{pkg_url}", rev="{rev}"))'
-    )
-    for repo in REPOS:
-        if repo == "ClimaCoupler.jl":
-            continue
-        if repo not in repo_revs:
-            raise ValueError(f"No revision found for repository {repo}")
-        repo_url = f"https://github.com/CliMA/{repo}"
-        rev = repo_revs[repo]["rev"]
-        julia_cmd = julia_cmd_template.format(pkg_url=repo_url, rev=rev)
-        log("Adding package:", repo, "at rev:", rev)
-        run_julia_command(env_dir, julia_cmd)
-    # Resolve the environment
-    log("Resolving environment")
-    run_julia_command(env_dir, "using Pkg; Pkg.resolve();")
-    # Add MPI
-    log("Adding MPI package")
-    run_julia_command(env_dir, 'using Pkg; Pkg.add("MPI");')
-    # Precompile and print the env status
-    log("Precompiling packages")
-    run_julia_command(env_dir, "using Pkg; Pkg.precompile();")
-    run_julia_command(env_dir, "using Pkg; Pkg.status();")
+    if "copy" in done and os.path.isdir(coupler_dir):
+        log("Using ClimaCoupler copied by a previous run:", coupler_dir)
+        repos_to_add = state["repos_to_add"]
+    else:
+        # Anything set up in an old copy is lost when it's replaced
+        done[:] = ["revs"]
+        coupler_rev = repo_revs["ClimaCoupler.jl"]["rev"]
+        log("Copying ClimaCoupler at rev:", coupler_rev)
+        # Delete ClimaCoupler directory if it already exists
+        if os.path.exists(coupler_dir):
+            log("Removing existing ClimaCoupler directory:", coupler_dir)
+            remove_repo_copy("./repos/ClimaCoupler.jl", coupler_dir)
+        copy_repo_at_rev(
+            repo_path="./repos/ClimaCoupler.jl",
+            rev=coupler_rev,
+            dest_path=coupler_dir,
+        )
+        # If another run's environment has mostly the same revs, start from
+        # its project and manifest so we only need to add the packages that
+        # changed
+        repos_to_add = [repo for repo in REPOS if repo != "ClimaCoupler.jl"]
+        reusable_env = None
+        if not args.fresh_env:
+            reusable_env = find_reusable_env(run_dir, repo_revs)
+        if reusable_env is not None:
+            prior_env_dir, repos_to_add = reusable_env
+            log("Reusing environment from:", prior_env_dir)
+            for fname in os.listdir(prior_env_dir):
+                if is_env_file(fname):
+                    # Copy rather than link, since Pkg rewrites these in place
+                    shutil.copy2(
+                        os.path.join(prior_env_dir, fname),
+                        os.path.join(env_dir, fname),
+                    )
+        state["repos_to_add"] = repos_to_add
+        done.append("copy")
+        save_state(run_dir, state)
+    # Set up the environment in a single Julia session so we only pay
+    # startup once. Pkg.add resolves the environment itself, so there's no
+    # need for a separate Pkg.resolve
+    julia_phases = ["instantiate", "add", "precompile"]
+    if all(phase in done for phase in julia_phases):
+        log("Environment already set up by a previous run")
+    else:
+        with JuliaSession(env_dir) as julia:
+            julia.run("using Pkg")
+            if "instantiate" not in done:
+                # Skip instantiating if we've already done so for this exact
+                # project and manifest, e.g., in a previous run whose
+                # ClimaCoupler copy was since deleted
+                instantiated_marker = os.path.join(
+                    run_dir, f".instantiated-{hash_env(env_dir)}"
+                )
+                if os.path.exists(instantiated_marker) and not (
+                    args.fresh_env or args.restart
+                ):
+                    log("Environment already instantiated at:", env_dir)
+                else:
+                    log("Instantiating ClimaEarth environment at:", env_dir)
+                    julia.run("Pkg.instantiate()")
+                    open(instantiated_marker, "w").close()
+                done.append("instantiate")
+                save_state(run_dir, state)
+            if "add" not in done:
+                # Add the rev for each package to the environment, along with
+                # MPI, in a single Pkg.add call so Pkg only resolves once
+                specs = []
+                for repo in repos_to_add:
+                    if repo not in repo_revs:
+                        raise ValueError(
+                            f"No revision found for repository {repo}"
+                        )
+                    repo_url = f"https://github.com/CliMA/{repo}"
+                    rev = repo_revs[repo]["rev"]
+                    log("Adding package:", repo, "at rev:", rev)
+                    specs.append(
+                        f'Pkg.PackageSpec(; url="{repo_url}", rev="{rev}")'
+                    )
+                log("Adding MPI package")
+                specs.append('Pkg.PackageSpec(; name="MPI")')
+                julia.run(f"Pkg.add([{', '.join(specs)}])")
+                done.append("add")
+                save_state(run_dir, state)
+            if "precompile" not in done:
+                log("Precompiling packages")
+                julia.run("Pkg.precompile()")
+                done.append("precompile")
+                save_state(run_dir, state)
+            # Print the env status
+            julia.run("Pkg.status()")
     # Copy ClimaEarth manifest file back into run dir for record-keeping
     manifest_src = os.path.join(env_dir, "Manifest-v1.11.toml")
     manifest_dest = os.path.join(run_dir, "Manifest-v1.11.toml")
+    # Copy rather than link, since Pkg rewrites the env's manifest in place.
+    # Remove any existing record first in case an older run hardlinked it
+    if os.path.lexists(manifest_dest):
+        os.remove(manifest_dest)
     shutil.copy2(manifest_src, manifest_dest)
     # Export detected Git revs to JSON file
     with open(os.path.join(run_dir, "repo-revs.json"), "w") as f:
@@ -181,14 +630,14 @@ def main():
         src = os.path.join(config_src_dir, config)
         dest = os.path.join(config_dest_dir, config)
         log(f"  {src} -> {dest}")
-        shutil.copy2(src, dest)
+        link_or_copy(src, dest)
     # Copy in the TOML file
     log("Copying ClimaCoupler TOML file")
     toml_src = "./repos/ClimaCoupler.jl/toml/amip_progedmf_1m.toml"
     toml_dest = os.path.join(
         run_dir, "ClimaCoupler.jl", "toml", "amip_progedmf_1m.toml"
     )
-    shutil.copy2(toml_src, toml_dest)
+    link_or_copy(toml_src, toml_dest)
     # Set env var to use CUDA with ClimaComms
     os.environ["CLIMACOMMS_DEVICE"] = "CUDA"
     # Set environmental variable for julia to not use global packages for